@@ -3,16 +3,23 @@ import os
 import json
 import re
 import random
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from collections import deque
 import assemblyai as aai
 import openai  # Ensure the OpenAI library is installed
+import httpx  # Installed with the AssemblyAI SDK; used for streaming uploads.
+import numpy as np
 
-from PyQt5.QtCore import Qt, QThread, pyqtSignal, QTimer
-from PyQt5.QtGui import QFont
+from PyQt5.QtCore import Qt, QThread, pyqtSignal, QTimer, QPoint
+from PyQt5.QtGui import QFont, QColor, QTextCharFormat, QTextCursor
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QTextEdit, QAction,
     QFileDialog, QMessageBox, QInputDialog, QProgressBar, QStatusBar,
     QDialog, QFormLayout, QDialogButtonBox, QLineEdit, QVBoxLayout,
-    QHBoxLayout, QLabel, QPushButton, QWidget, QDockWidget, QCheckBox
+    QHBoxLayout, QLabel, QPushButton, QWidget, QDockWidget, QCheckBox,
+    QTableWidget, QTableWidgetItem, QHeaderView
 )
 
 # ----------------------------
@@ -20,6 +27,19 @@ from PyQt5.QtWidgets import (
 # ----------------------------
 
 CONFIG_FILE = "config.json"
+UPLOAD_CACHE_FILE = "upload_cache.json"
+UPLOAD_CHUNK_SIZE = 5 * 1024 * 1024   # Bytes read from disk and sent per chunk.
+UPLOAD_MAX_ATTEMPTS = 5
+UPLOAD_BACKOFF_SECONDS = 2            # Doubles after each failed attempt.
+UPLOAD_TIMEOUT_SECONDS = 60
+UPLOAD_URL_MAX_AGE = 24 * 3600        # Re-upload rather than trust an older upload URL.
+TRANSCRIPT_LIBRARY_DIR = "transcripts"  # Per-transcript utterance data used for analytics.
+WORD_BOOST_LIMIT = 1000               # AssemblyAI accepts at most this many custom vocabulary terms...
+WORD_BOOST_MAX_WORDS = 6              # ...of at most this many words each.
+SEARCH_CHUNK_SIZE = 64 * 1024      # Characters scanned per streamed batch of matches.
+SEARCH_OVERLAP = 4096              # Extra characters scanned past each chunk so boundary matches are whole.
+SEARCH_DEBOUNCE_MS = 300           # Delay before re-searching after the document changes.
+MAX_VISIBLE_HIGHLIGHTS = 2000      # Upper bound on highlights drawn for the visible area.
 
 def load_config():
     if not os.path.exists(CONFIG_FILE):
@@ -31,6 +51,51 @@ def save_config(config):
     with open(CONFIG_FILE, "w") as f:
         json.dump(config, f, indent=4)
 
+upload_cache_lock = threading.Lock()
+
+def upload_cache_key(file_path):
+    # Identifies a recording by path, size and modification time so edited files are re-uploaded.
+    stat = os.stat(file_path)
+    return f"{os.path.abspath(file_path)}|{stat.st_size}|{stat.st_mtime_ns}"
+
+def load_upload_cache():
+    if not os.path.exists(UPLOAD_CACHE_FILE):
+        return {}
+    try:
+        with open(UPLOAD_CACHE_FILE, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def get_cached_upload_url(file_path):
+    with upload_cache_lock:
+        entry = load_upload_cache().get(upload_cache_key(file_path))
+    if entry and time.time() - entry.get("uploaded_at", 0) < UPLOAD_URL_MAX_AGE:
+        return entry.get("upload_url")
+    return None
+
+def remember_upload_url(file_path, upload_url):
+    with upload_cache_lock:
+        cache = load_upload_cache()
+        now = time.time()
+        cache = {key: entry for key, entry in cache.items() if now - entry.get("uploaded_at", 0) < UPLOAD_URL_MAX_AGE}
+        cache[upload_cache_key(file_path)] = {"upload_url": upload_url, "uploaded_at": now}
+        with open(UPLOAD_CACHE_FILE, "w") as f:
+            json.dump(cache, f, indent=4)
+
+def forget_upload_url(file_path):
+    with upload_cache_lock:
+        cache = load_upload_cache()
+        if cache.pop(upload_cache_key(file_path), None) is not None:
+            with open(UPLOAD_CACHE_FILE, "w") as f:
+                json.dump(cache, f, indent=4)
+
+def format_bytes(num_bytes):
+    for unit in ("B", "KB", "MB", "GB"):
+        if num_bytes < 1024 or unit == "GB":
+            return f"{num_bytes:.0f} {unit}" if unit == "B" else f"{num_bytes:.1f} {unit}"
+        num_bytes /= 1024.0
+
 def extract_json(text):
     try:
         return json.loads(text)
@@ -43,18 +108,310 @@ def extract_json(text):
         else:
             raise ValueError("No valid JSON found in text.")
 
+def build_search_pattern(query, use_regex=False, whole_word=False, case_sensitive=False):
+    # Raises re.error if a regular expression is invalid.
+    expression = query if use_regex else re.escape(query)
+    if whole_word:
+        expression = rf"(?<!\w)(?:{expression})(?!\w)"
+    flags = 0 if case_sensitive else re.IGNORECASE
+    return re.compile(expression, flags)
+
+NON_BMP_RE = re.compile("[\U00010000-\U0010FFFF]")
+
+class Utf16Offsets:
+    # Python indexes strings by code point, QTextCursor by UTF-16 code unit; characters outside the
+    # BMP (emoji, for example) take two code units, so every position after one must be shifted.
+    def __init__(self, text):
+        self.code_points = [match.start() for match in NON_BMP_RE.finditer(text)]
+        self.code_units = [position + i for i, position in enumerate(self.code_points)]
+
+    def to_qt(self, position):
+        return position + bisect_left(self.code_points, position)
+
+    def from_qt(self, position):
+        return position - bisect_left(self.code_units, position)
+
+def apply_text_edits(document, text, edits):
+    # edits are sorted, non-overlapping (start, end, replacement) tuples in Python offsets into text,
+    # which must be the document's current toPlainText().
+    offsets = Utf16Offsets(text)
+    cursor = QTextCursor(document)
+    cursor.beginEditBlock()  # One undo step for the whole operation.
+    # Work back to front so earlier positions stay valid.
+    for start, end, replacement in reversed(edits):
+        cursor.setPosition(offsets.to_qt(start))
+        cursor.setPosition(offsets.to_qt(end), QTextCursor.KeepAnchor)
+        cursor.insertText(replacement)
+    cursor.endEditBlock()
+
 def seconds_to_hhmmss(seconds):
     hours = int(seconds // 3600)
     minutes = int((seconds % 3600) // 60)
     secs = int(seconds % 60)
     return f"{hours:02d}:{minutes:02d}:{secs:02d}"
 
+# ----------------------------
+# Speaker Analytics
+# ----------------------------
+
+def utterance_columns(utterances):
+    # Flattens SDK utterances into plain columns once, so the statistics never touch the objects.
+    return {
+        "speakers": [utt.speaker for utt in utterances],
+        "start": [utt.start for utt in utterances],
+        "end": [utt.end for utt in utterances],
+        "words": [len(utt.words) if utt.words else len(utt.text.split()) for utt in utterances],
+    }
+
+def speaker_display_names(speakers, speaker_names):
+    # Maps raw labels ("A") to the names applied through the mapping panel ("Speaker A" -> "Alice").
+    speakers = np.asarray(speakers, dtype=str)
+    if speakers.size == 0:
+        return speakers.astype(object)
+    labels, inverse = np.unique(speakers, return_inverse=True)
+    names = np.array([speaker_names.get(f"Speaker {label}", f"Speaker {label}") for label in labels], dtype=object)
+    return names[inverse]
+
+def compute_speaker_stats(speakers, starts, ends, words, transcript_ids=None):
+    # Utterances must be in time order within each transcript, and each transcript contiguous.
+    speakers = np.asarray(speakers, dtype=object).astype(str)
+    if speakers.size == 0:
+        return []
+    starts = np.asarray(starts, dtype=np.float64)
+    ends = np.asarray(ends, dtype=np.float64)
+    words = np.asarray(words, dtype=np.float64)
+    if transcript_ids is None:
+        transcript_ids = np.zeros(speakers.size, dtype=np.int64)
+    transcript_ids = np.asarray(transcript_ids)
+
+    names, codes = np.unique(speakers, return_inverse=True)
+    count = names.size
+    same_transcript = np.concatenate(([False], transcript_ids[1:] == transcript_ids[:-1]))
+    group = np.cumsum(~same_transcript) - 1
+    previous_codes = np.concatenate(([-1], codes[:-1]))
+    speaker_changed = codes != previous_codes
+
+    durations = np.clip(ends - starts, 0, None)
+    talk_ms = np.bincount(codes, weights=durations, minlength=count)
+    word_counts = np.bincount(codes, weights=words, minlength=count)
+    turns = np.bincount(codes[~same_transcript | speaker_changed], minlength=count)
+
+    # An interruption is a speaker starting before everyone before them has finished. Offsetting each
+    # transcript past the previous one's end lets a single running maximum cover the whole batch.
+    offset = group * (max(ends.max(), starts.max()) + 1)
+    latest_end = np.maximum.accumulate(ends + offset)
+    previous_latest_end = np.concatenate(([-np.inf], latest_end[:-1]))
+    interrupted = same_transcript & speaker_changed & (starts + offset < previous_latest_end)
+    interruptions = np.bincount(codes[interrupted], minlength=count)
+
+    appearances = np.bincount(np.unique(group * count + codes) % count, minlength=count)
+
+    total_ms = talk_ms.sum()
+    talk_minutes = talk_ms / 60000.0
+    words_per_minute = np.divide(word_counts, talk_minutes, out=np.zeros(count), where=talk_minutes > 0)
+    average_turn = np.divide(talk_ms / 1000.0, turns, out=np.zeros(count), where=turns > 0)
+
+    stats = []
+    for index in np.argsort(-talk_ms, kind="stable"):
+        stats.append({
+            "speaker": str(names[index]),
+            "talk_time": float(talk_ms[index] / 1000.0),
+            "share": float(talk_ms[index] / total_ms) if total_ms else 0.0,
+            "turns": int(turns[index]),
+            "average_turn": float(average_turn[index]),
+            "interruptions": int(interruptions[index]),
+            "words": int(word_counts[index]),
+            "words_per_minute": float(words_per_minute[index]),
+            "transcripts": int(appearances[index]),
+        })
+    return stats
+
+def transcript_speaker_stats(utterances, speaker_names=None):
+    columns = utterance_columns(utterances)
+    speakers = speaker_display_names(columns["speakers"], speaker_names or {})
+    return compute_speaker_stats(speakers, columns["start"], columns["end"], columns["words"])
+
+def save_library_transcript(transcript_id, columns, speaker_names, library_dir=TRANSCRIPT_LIBRARY_DIR):
+    os.makedirs(library_dir, exist_ok=True)
+    path = os.path.join(library_dir, f"{transcript_id}.json")
+    with open(path, "w") as f:
+        json.dump(dict(columns, id=transcript_id, speaker_names=speaker_names), f)
+    return path
+
+def library_speaker_stats(library_dir=TRANSCRIPT_LIBRARY_DIR):
+    # Returns (stats, skipped), where skipped lists (file name, reason) for files that could not be read.
+    speakers, starts, ends, words, transcript_ids = [], [], [], [], []
+    skipped = []
+    if os.path.isdir(library_dir):
+        for index, file_name in enumerate(sorted(os.listdir(library_dir))):
+            if not file_name.endswith(".json"):
+                continue
+            try:
+                with open(os.path.join(library_dir, file_name), "r") as f:
+                    data = json.load(f)
+            except (OSError, ValueError) as e:
+                skipped.append((file_name, str(e)))
+                continue
+            if not isinstance(data, dict):
+                skipped.append((file_name, "not a transcript object"))
+                continue
+            if not data.get("speakers"):
+                continue
+            try:
+                columns = [np.asarray(data[key], dtype=np.float64) for key in ("start", "end", "words")]
+            except (KeyError, TypeError, ValueError) as e:
+                skipped.append((file_name, f"malformed utterance data: {e}"))
+                continue
+            if any(column.shape != (len(data["speakers"]),) for column in columns):
+                skipped.append((file_name, "utterance columns have different lengths"))
+                continue
+            speakers.append(speaker_display_names(data["speakers"], data.get("speaker_names") or {}))
+            starts.append(columns[0])
+            ends.append(columns[1])
+            words.append(columns[2])
+            transcript_ids.append(np.full(len(data["speakers"]), index, dtype=np.int64))
+    if not speakers:
+        return [], skipped
+    stats = compute_speaker_stats(
+        np.concatenate(speakers), np.concatenate(starts), np.concatenate(ends),
+        np.concatenate(words), np.concatenate(transcript_ids)
+    )
+    return stats, skipped
+
+# ----------------------------
+# Glossary Corrections
+# ----------------------------
+
+def fold_case(text):
+    # Lower-cases without changing the length, so positions in the folded text match the original.
+    folded = text.lower()
+    if len(folded) == len(text):
+        return folded
+    return "".join(c.lower() if len(c.lower()) == 1 else c for c in text)
+
+def is_word_char(c):
+    return c.isalnum() or c == "_"
+
+class GlossaryMatcher:
+    # Aho-Corasick automaton over all "wrong" terms: the text is scanned once no matter how many
+    # terms there are. Entries are dicts with wrong, right, match_case and whole_word keys.
+    def __init__(self, entries):
+        self.rules = [entry for entry in entries if entry.get("wrong")]
+        self.lengths = []
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]
+        for index, rule in enumerate(self.rules):
+            pattern = fold_case(rule["wrong"])
+            self.lengths.append(len(pattern))
+            node = 0
+            for c in pattern:
+                child = self.goto[node].get(c)
+                if child is None:
+                    child = len(self.goto)
+                    self.goto[node][c] = child
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                node = child
+            self.output[node].append(index)
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for c, child in self.goto[node].items():
+                queue.append(child)
+                state = self.fail[node]
+                while state and c not in self.goto[state]:
+                    state = self.fail[state]
+                self.fail[child] = self.goto[state].get(c, 0)
+                self.output[child] = self.output[child] + self.output[self.fail[child]]
+
+    def find(self, text):
+        # Returns non-overlapping (start, end, replacement) tuples, preferring the leftmost, longest match.
+        if not self.rules:
+            return []
+        goto, fail, output = self.goto, self.fail, self.output
+        candidates = []
+        node = 0
+        for i, c in enumerate(fold_case(text)):
+            while node and c not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(c, 0)
+            for index in output[node]:
+                start, end = i + 1 - self.lengths[index], i + 1
+                rule = self.rules[index]
+                if rule.get("match_case") and text[start:end] != rule["wrong"]:
+                    continue
+                if rule.get("whole_word", True) and (
+                    (start > 0 and is_word_char(text[start - 1])) or (end < len(text) and is_word_char(text[end]))
+                ):
+                    continue
+                candidates.append((start, end, rule.get("right", "")))
+        candidates.sort(key=lambda match: (match[0], match[0] - match[1]))
+        matches = []
+        last_end = 0
+        for start, end, replacement in candidates:
+            if start >= last_end:
+                matches.append((start, end, replacement))
+                last_end = end
+        return matches
+
+    def apply(self, text):
+        matches = self.find(text)
+        pieces = []
+        position = 0
+        for start, end, replacement in matches:
+            pieces.append(text[position:start])
+            pieces.append(replacement)
+            position = end
+        pieces.append(text[position:])
+        return "".join(pieces), len(matches)
+
+def glossary_word_boost(entries):
+    # The corrected spellings double as custom vocabulary, so the recognizer gets them right more often.
+    terms = []
+    seen = set()
+    for entry in entries:
+        term = entry.get("right", "").strip()
+        if term and len(term.split()) <= WORD_BOOST_MAX_WORDS and term.lower() not in seen:
+            seen.add(term.lower())
+            terms.append(term)
+    return terms[:WORD_BOOST_LIMIT]
+
+TRANSCRIPT_LABEL_RE = re.compile(r"^(?:\[\d{2}:\d{2}:\d{2}\] )?Speaker\s+[A-Z0-9]+:", re.MULTILINE)
+
+def format_utterances(utterances, glossary=None, with_timestamps=False):
+    # The glossary only sees each utterance's text, so a term like "c" can never touch "Speaker C:".
+    lines = []
+    for utt in utterances:
+        text = glossary.apply(utt.text)[0] if glossary else utt.text
+        prefix = f"[{seconds_to_hhmmss(utt.start / 1000.0)}] " if with_timestamps else ""
+        lines.append(f"{prefix}Speaker {utt.speaker}: {text}\n")
+    return "".join(lines)
+
+def skip_transcript_labels(text, matches):
+    # Drops glossary matches that overlap a line's "[hh:mm:ss] Speaker X:" prefix, which the speaker
+    # detection and mapping rely on.
+    labels = [match.span() for match in TRANSCRIPT_LABEL_RE.finditer(text)]
+    label_starts = [start for start, _end in labels]
+    kept = []
+    for match in matches:
+        start, end = match[0], match[1]
+        index = bisect_right(label_starts, start) - 1
+        if index >= 0 and start < labels[index][1]:
+            continue
+        if index + 1 < len(labels) and labels[index + 1][0] < end:
+            continue
+        kept.append(match)
+    return kept
+
 config = load_config()
 API_KEY = config.get("assemblyai_api_key", "")
 OPENAI_API_KEY = config.get("openai_api_key", "")
+OPENAI_BASE_URL = None  # None uses the official endpoint (or the OPENAI_BASE_URL environment variable).
 
 aai.settings.api_key = API_KEY  # Use AssemblyAI API key.
-# For OpenAI, we'll set openai.api_key when needed.
+# For OpenAI, a client is created with the current key when needed.
 
 # ----------------------------
 # Settings Dialog
@@ -87,6 +444,84 @@ class SettingsDialog(QDialog):
     def get_values(self):
         return self.assemblyai_edit.text().strip(), self.openai_edit.text().strip()
 
+# ----------------------------
+# Glossary Dialog
+# ----------------------------
+class GlossaryDialog(QDialog):
+    COLUMNS = ["Wrong", "Right", "Match Case", "Whole Word"]
+
+    def __init__(self, entries, auto_apply, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Glossary")
+        self.setModal(True)
+        self.resize(600, 400)
+        self.init_ui(entries, auto_apply)
+
+    def init_ui(self, entries, auto_apply):
+        layout = QVBoxLayout(self)
+        layout.addWidget(QLabel("Terms the transcript gets wrong and how they should be spelled:"))
+
+        self.table = QTableWidget(0, len(self.COLUMNS), self)
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.table.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
+        for entry in entries:
+            self.add_row(entry)
+        layout.addWidget(self.table)
+
+        row_buttons = QHBoxLayout()
+        add_button = QPushButton("Add Term", self)
+        add_button.clicked.connect(lambda: self.add_row())
+        row_buttons.addWidget(add_button)
+        remove_button = QPushButton("Remove Selected", self)
+        remove_button.clicked.connect(self.remove_selected_rows)
+        row_buttons.addWidget(remove_button)
+        row_buttons.addStretch()
+        layout.addLayout(row_buttons)
+
+        self.auto_apply_checkbox = QCheckBox("Apply automatically after transcription", self)
+        self.auto_apply_checkbox.setChecked(auto_apply)
+        layout.addWidget(self.auto_apply_checkbox)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel, self)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+
+    def add_row(self, entry=None):
+        entry = entry or {}
+        row = self.table.rowCount()
+        self.table.insertRow(row)
+        self.table.setItem(row, 0, QTableWidgetItem(entry.get("wrong", "")))
+        self.table.setItem(row, 1, QTableWidgetItem(entry.get("right", "")))
+        for column, key, default in ((2, "match_case", False), (3, "whole_word", True)):
+            item = QTableWidgetItem()
+            item.setFlags(Qt.ItemIsEnabled | Qt.ItemIsUserCheckable | Qt.ItemIsSelectable)
+            item.setCheckState(Qt.Checked if entry.get(key, default) else Qt.Unchecked)
+            self.table.setItem(row, column, item)
+        if not entry:
+            self.table.editItem(self.table.item(row, 0))
+
+    def remove_selected_rows(self):
+        for row in sorted({index.row() for index in self.table.selectedIndexes()}, reverse=True):
+            self.table.removeRow(row)
+
+    def get_values(self):
+        entries = []
+        for row in range(self.table.rowCount()):
+            wrong = self.table.item(row, 0).text().strip() if self.table.item(row, 0) else ""
+            right = self.table.item(row, 1).text().strip() if self.table.item(row, 1) else ""
+            if not wrong:
+                continue
+            entries.append({
+                "wrong": wrong,
+                "right": right,
+                "match_case": self.table.item(row, 2).checkState() == Qt.Checked,
+                "whole_word": self.table.item(row, 3).checkState() == Qt.Checked,
+            })
+        return entries, self.auto_apply_checkbox.isChecked()
+
 # ----------------------------
 # Transcription Thread
 # ----------------------------
@@ -94,26 +529,109 @@ class TranscriptionThread(QThread):
     # Emits a tuple: (plain transcript text, full transcript object)
     transcription_finished = pyqtSignal(object)
     error_occurred = pyqtSignal(str)
+    upload_progress = pyqtSignal('qint64', 'qint64')  # Bytes sent, total bytes.
+    status_changed = pyqtSignal(str)
 
-    def __init__(self, file_path, parent=None):
+    def __init__(self, file_path, use_upload_cache=True, word_boost=None, glossary=None, parent=None):
         super().__init__(parent)
         self.file_path = file_path
+        self.use_upload_cache = use_upload_cache
+        self.word_boost = word_boost or []
+        self.glossary = glossary  # GlossaryMatcher applied to the text before it is emitted, or None.
 
     def run(self):
         try:
+            audio_url, from_cache = self.get_audio_url()
             transcriber = aai.Transcriber()
             # Enable speaker diarization.
             config_trans = aai.TranscriptionConfig(
                 speaker_labels=True
             )
-            transcript = transcriber.transcribe(self.file_path, config=config_trans)
-            result_text = ""
-            for utterance in transcript.utterances:
-                result_text += f"Speaker {utterance.speaker}: {utterance.text}\n"
+            if self.word_boost:
+                config_trans.set_word_boost(self.word_boost)
+            # Passing the upload URL keeps the SDK from uploading the file a second time.
+            transcript = transcriber.transcribe(audio_url, config=config_trans)
+            if transcript.status == aai.TranscriptStatus.error and from_cache:
+                # The cached upload may no longer exist; send the file again once before giving up.
+                forget_upload_url(self.file_path)
+                self.status_changed.emit("Previous upload is no longer available, uploading file again...")
+                transcript = transcriber.transcribe(self.upload_and_remember(), config=config_trans)
+            if transcript.status == aai.TranscriptStatus.error:
+                if self.use_upload_cache:
+                    forget_upload_url(self.file_path)
+                raise RuntimeError(transcript.error)
+            result_text = format_utterances(transcript.utterances, self.glossary)
             self.transcription_finished.emit((result_text, transcript))
         except Exception as e:
             self.error_occurred.emit(str(e))
 
+    def get_audio_url(self):
+        # Returns (upload URL, whether it came from the upload cache).
+        if self.use_upload_cache:
+            upload_url = get_cached_upload_url(self.file_path)
+            if upload_url:
+                self.status_changed.emit("Reusing previous upload, transcribing file...")
+                return upload_url, True
+        return self.upload_and_remember(), False
+
+    def upload_and_remember(self):
+        upload_url = self.upload_with_retry()
+        if self.use_upload_cache:
+            remember_upload_url(self.file_path, upload_url)
+        return upload_url
+
+    def upload_with_retry(self):
+        # The upload endpoint takes the whole file in one request, so an interrupted upload is
+        # retried from the start; a finished one is cached and never sent again.
+        for attempt in range(1, UPLOAD_MAX_ATTEMPTS + 1):
+            try:
+                return self.upload_file()
+            except (httpx.TransportError, httpx.HTTPStatusError) as e:
+                retry_after = 0
+                if isinstance(e, httpx.HTTPStatusError):
+                    status = e.response.status_code
+                    if status != 429 and status < 500:
+                        raise
+                    try:
+                        retry_after = float(e.response.headers.get("retry-after", 0))
+                    except ValueError:
+                        pass
+                if attempt == UPLOAD_MAX_ATTEMPTS:
+                    raise
+                delay = max(UPLOAD_BACKOFF_SECONDS * 2 ** (attempt - 1) + random.uniform(0, 1), retry_after)
+                self.status_changed.emit(
+                    f"Upload interrupted ({e}); retrying in {delay:.0f}s "
+                    f"(attempt {attempt + 1} of {UPLOAD_MAX_ATTEMPTS})..."
+                )
+                time.sleep(delay)
+
+    def upload_file(self):
+        total = os.path.getsize(self.file_path)
+
+        def read_chunks():
+            sent = 0
+            self.upload_progress.emit(sent, total)
+            with open(self.file_path, "rb") as f:
+                while True:
+                    chunk = f.read(UPLOAD_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    yield chunk
+                    sent += len(chunk)
+                    self.upload_progress.emit(sent, total)
+
+        base_url = aai.settings.base_url.rstrip("/")
+        if not base_url.endswith("/v2"):
+            base_url += "/v2"
+        response = httpx.post(
+            f"{base_url}/upload",
+            content=read_chunks(),
+            headers={"authorization": aai.settings.api_key, "content-type": "application/octet-stream"},
+            timeout=UPLOAD_TIMEOUT_SECONDS,
+        )
+        response.raise_for_status()
+        return response.json()["upload_url"]
+
 # ----------------------------
 # Mapping Worker (for OpenAI API call)
 # ----------------------------
@@ -127,8 +645,8 @@ class MappingWorker(QThread):
 
     def run(self):
         try:
-            openai.api_key = OPENAI_API_KEY
-            response = openai.ChatCompletion.create(
+            client = openai.OpenAI(api_key=OPENAI_API_KEY, base_url=OPENAI_BASE_URL)
+            response = client.chat.completions.create(
                 model="o1",
                 messages=[
                     {"role": "system", "content": "You are an expert in speaker attribution."},
@@ -141,30 +659,150 @@ class MappingWorker(QThread):
             self.errorOccurred.emit(str(e))
 
 # ----------------------------
-# Search & Replace Dialog
+# Library Analytics Worker
 # ----------------------------
-class SearchReplaceDialog(QDialog):
+class LibraryAnalyticsWorker(QThread):
+    statsReady = pyqtSignal(list, list)  # Per-speaker stats, skipped (file name, reason) pairs.
+    errorOccurred = pyqtSignal(str)
+
+    def __init__(self, library_dir=TRANSCRIPT_LIBRARY_DIR, parent=None):
+        super().__init__(parent)
+        self.library_dir = library_dir
+
+    def run(self):
+        try:
+            stats, skipped = library_speaker_stats(self.library_dir)
+            self.statsReady.emit(stats, skipped)
+        except Exception as e:
+            self.errorOccurred.emit(str(e))
+
+# ----------------------------
+# Search Worker (incremental find)
+# ----------------------------
+class SearchWorker(QThread):
+    # Each signal carries the search generation so stale results can be ignored.
+    matchesFound = pyqtSignal(int, list)    # Batch of (start, end) positions, in document order.
+    searchFinished = pyqtSignal(int, int)   # Total number of matches.
+
+    def __init__(self, generation, text, pattern, chunk_size=SEARCH_CHUNK_SIZE, parent=None):
+        super().__init__(parent)
+        self.generation = generation
+        self.text = text  # Snapshot taken on the GUI thread; QTextDocument is not thread-safe.
+        self.pattern = pattern
+        self.chunk_size = chunk_size
+
+    def run(self):
+        text = self.text
+        length = len(text)
+        total = 0
+        position = 0
+        window = self.chunk_size
+        # Scan one window at a time so no single regex call holds the GIL for long and cancellation
+        # is checked between windows. Each window reads SEARCH_OVERLAP characters past its chunk so
+        # lookaheads and whole-word checks near the boundary see the real text.
+        while position < length:
+            if self.isInterruptionRequested():
+                return
+            chunk_end = min(position + window, length)
+            scan_end = min(chunk_end + SEARCH_OVERLAP, length)
+            batch = []
+            next_position = chunk_end
+            for match in self.pattern.finditer(text, position, scan_end):
+                start, end = match.span()
+                if start >= chunk_end:
+                    break
+                if end >= scan_end and scan_end < length:
+                    # The window may have cut this match short; rescan from its start.
+                    next_position = start
+                    break
+                if start == end:
+                    continue  # Skip empty regex matches; there is nothing to highlight or replace.
+                batch.append((start, end))
+                next_position = max(chunk_end, end)
+            if next_position == position:
+                window *= 2  # A single match longer than the window; widen it until the match fits.
+                continue
+            window = self.chunk_size
+            position = next_position
+            if batch:
+                self.matchesFound.emit(self.generation, batch)
+                total += len(batch)
+        self.searchFinished.emit(self.generation, total)
+
+# ----------------------------
+# Search & Replace Widget (Bottom Panel)
+# ----------------------------
+class SearchReplaceWidget(QWidget):
+    searchChanged = pyqtSignal()
+    findNextRequested = pyqtSignal()
+    findPreviousRequested = pyqtSignal()
+    replaceRequested = pyqtSignal()
+    replaceAllRequested = pyqtSignal()
+
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.setWindowTitle("Search and Replace")
-        self.setModal(True)
-        layout = QFormLayout(self)
-        
+        self.init_ui()
+
+    def init_ui(self):
+        layout = QVBoxLayout(self)
+
+        search_layout = QHBoxLayout()
+        search_layout.addWidget(QLabel("Search for:"))
         self.search_edit = QLineEdit(self)
+        self.search_edit.textChanged.connect(lambda: self.searchChanged.emit())
+        self.search_edit.returnPressed.connect(lambda: self.findNextRequested.emit())
+        search_layout.addWidget(self.search_edit)
+        self.find_previous_button = QPushButton("Find Previous", self)
+        self.find_previous_button.clicked.connect(lambda: self.findPreviousRequested.emit())
+        search_layout.addWidget(self.find_previous_button)
+        self.find_next_button = QPushButton("Find Next", self)
+        self.find_next_button.clicked.connect(lambda: self.findNextRequested.emit())
+        search_layout.addWidget(self.find_next_button)
+        layout.addLayout(search_layout)
+
+        replace_layout = QHBoxLayout()
+        replace_layout.addWidget(QLabel("Replace with:"))
         self.replace_edit = QLineEdit(self)
-        layout.addRow("Search for:", self.search_edit)
-        layout.addRow("Replace with:", self.replace_edit)
-        
-        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel, self)
-        buttons.accepted.connect(self.accept)
-        buttons.rejected.connect(self.reject)
-        layout.addWidget(buttons)
-    
-    @staticmethod
-    def getValues(parent=None):
-        dialog = SearchReplaceDialog(parent)
-        result = dialog.exec_()
-        return (dialog.search_edit.text(), dialog.replace_edit.text(), result == QDialog.Accepted)
+        replace_layout.addWidget(self.replace_edit)
+        self.replace_button = QPushButton("Replace", self)
+        self.replace_button.clicked.connect(lambda: self.replaceRequested.emit())
+        replace_layout.addWidget(self.replace_button)
+        self.replace_all_button = QPushButton("Replace All", self)
+        self.replace_all_button.clicked.connect(lambda: self.replaceAllRequested.emit())
+        replace_layout.addWidget(self.replace_all_button)
+        layout.addLayout(replace_layout)
+
+        options_layout = QHBoxLayout()
+        self.regex_checkbox = QCheckBox("Regular expression", self)
+        self.whole_word_checkbox = QCheckBox("Whole word", self)
+        self.case_checkbox = QCheckBox("Match case", self)
+        for checkbox in (self.regex_checkbox, self.whole_word_checkbox, self.case_checkbox):
+            checkbox.toggled.connect(lambda _checked: self.searchChanged.emit())
+            options_layout.addWidget(checkbox)
+        options_layout.addStretch()
+        self.status_label = QLabel("", self)
+        options_layout.addWidget(self.status_label)
+        layout.addLayout(options_layout)
+
+    def getQuery(self):
+        return self.search_edit.text()
+
+    def getReplacement(self):
+        return self.replace_edit.text()
+
+    def getOptions(self):
+        return {
+            "use_regex": self.regex_checkbox.isChecked(),
+            "whole_word": self.whole_word_checkbox.isChecked(),
+            "case_sensitive": self.case_checkbox.isChecked(),
+        }
+
+    def set_status(self, message):
+        self.status_label.setText(message)
+
+    def focus_search(self):
+        self.search_edit.setFocus()
+        self.search_edit.selectAll()
 
 # ----------------------------
 # Speaker Mapping Widget (Side Panel)
@@ -255,6 +893,60 @@ class SpeakerMappingWidget(QWidget):
     def clear_progress_log(self):
         self.progress_log.clear()
 
+# ----------------------------
+# Speaker Analytics Widget (Side Panel)
+# ----------------------------
+class SpeakerAnalyticsWidget(QWidget):
+    currentRequested = pyqtSignal()
+    libraryRequested = pyqtSignal()
+
+    COLUMNS = ["Speaker", "Talk Time", "Share", "Turns", "Avg Turn", "Interruptions", "Words/Min", "Transcripts"]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.init_ui()
+
+    def init_ui(self):
+        layout = QVBoxLayout(self)
+
+        buttons_layout = QHBoxLayout()
+        self.current_button = QPushButton("Current Transcript", self)
+        self.current_button.clicked.connect(lambda: self.currentRequested.emit())
+        buttons_layout.addWidget(self.current_button)
+        self.library_button = QPushButton("Whole Library", self)
+        self.library_button.clicked.connect(lambda: self.libraryRequested.emit())
+        buttons_layout.addWidget(self.library_button)
+        layout.addLayout(buttons_layout)
+
+        self.scope_label = QLabel("", self)
+        layout.addWidget(self.scope_label)
+
+        self.table = QTableWidget(0, len(self.COLUMNS), self)
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        layout.addWidget(self.table)
+
+    def set_scope(self, message):
+        self.scope_label.setText(message)
+
+    def show_stats(self, stats):
+        self.table.setRowCount(len(stats))
+        for row, entry in enumerate(stats):
+            values = [
+                entry["speaker"],
+                seconds_to_hhmmss(entry["talk_time"]),
+                f"{entry['share'] * 100:.1f}%",
+                str(entry["turns"]),
+                f"{entry['average_turn']:.1f}s",
+                str(entry["interruptions"]),
+                f"{entry['words_per_minute']:.0f}",
+                str(entry["transcripts"]),
+            ]
+            for column, value in enumerate(values):
+                self.table.setItem(row, column, QTableWidgetItem(value))
+
 # ----------------------------
 # Main Window
 # ----------------------------
@@ -280,10 +972,6 @@ class MainWindow(QMainWindow):
         self.progress.setVisible(False)
         self.status_bar.addPermanentWidget(self.progress)
 
-        self.status_timer = QTimer(self)
-        self.status_timer.setSingleShot(True)
-        self.status_timer.timeout.connect(self.update_transcribing_status)
-
         if not API_KEY:
             QMessageBox.critical(self, "Configuration Error", "AssemblyAI API key is missing! Please set it in Settings.")
 
@@ -314,6 +1002,31 @@ class MainWindow(QMainWindow):
         self.fake_progress_active = False
         self.mapping_worker = None  # For the MappingWorker instance.
         self.speaker_mapping_dock = None
+        self.speaker_names = {}  # Names applied through the mapping panel, e.g. {"Speaker A": "Alice"}.
+        self.library_transcript_id = None
+        self.analytics_dock = None
+        self.library_worker = None
+        self.glossary_matcher = GlossaryMatcher(config.get("glossary", []))
+
+        # Incremental search state. Match positions refer to self.search_text.
+        self.search_dock = None
+        self.search_worker = None
+        self.search_generation = 0
+        self.search_pattern = None
+        self.search_text = ""
+        self.search_offsets = Utf16Offsets("")  # Converts search_text offsets to cursor positions.
+        self.search_matches = []   # Sorted (start, end) tuples.
+        self.search_starts = []    # Start positions, kept parallel to search_matches for bisect.
+        self.search_running = False
+        self.current_match_index = -1
+        self.pending_replace_all = False
+        self.applying_replacement = False
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.timeout.connect(self.start_search)
+        self.text_edit.document().contentsChange.connect(self.on_document_changed)
+        self.text_edit.verticalScrollBar().valueChanged.connect(self.update_match_highlights)
+        self.text_edit.horizontalScrollBar().valueChanged.connect(self.update_match_highlights)
 
     def create_menus(self):
         menu_bar = self.menuBar()
@@ -353,20 +1066,48 @@ class MainWindow(QMainWindow):
         edit_menu.addAction(self.paste_action)
 
         self.search_replace_action = QAction("Search and Replace", self)
+        self.search_replace_action.setShortcut("Ctrl+F")
         self.search_replace_action.triggered.connect(self.search_and_replace)
         edit_menu.addAction(self.search_replace_action)
 
+        self.find_next_action = QAction("Find Next", self)
+        self.find_next_action.setShortcut("F3")
+        self.find_next_action.triggered.connect(self.find_next)
+        edit_menu.addAction(self.find_next_action)
+
+        self.find_previous_action = QAction("Find Previous", self)
+        self.find_previous_action.setShortcut("Shift+F3")
+        self.find_previous_action.triggered.connect(self.find_previous)
+        edit_menu.addAction(self.find_previous_action)
+
+        self.glossary_action = QAction("Glossary...", self)
+        self.glossary_action.triggered.connect(self.show_glossary_dialog)
+        edit_menu.addAction(self.glossary_action)
+
+        self.apply_glossary_action = QAction("Apply Glossary", self)
+        self.apply_glossary_action.triggered.connect(self.apply_glossary)
+        edit_menu.addAction(self.apply_glossary_action)
+
         view_menu = self.menuBar().addMenu("View")
         self.toggle_wrap_action = QAction("Toggle Word Wrap", self)
         self.toggle_wrap_action.triggered.connect(self.toggle_wrap)
         view_menu.addAction(self.toggle_wrap_action)
 
+        self.analytics_action = QAction("Speaker Analytics", self)
+        self.analytics_action.triggered.connect(self.show_current_analytics)
+        view_menu.addAction(self.analytics_action)
+
     def set_ui_enabled(self, enabled: bool):
         self.open_audio_action.setEnabled(enabled)
         self.settings_action.setEnabled(enabled)
         self.save_action.setEnabled(enabled)
         self.search_replace_action.setEnabled(enabled)
+        self.find_next_action.setEnabled(enabled)
+        self.find_previous_action.setEnabled(enabled)
+        self.glossary_action.setEnabled(enabled)
+        self.apply_glossary_action.setEnabled(enabled)
         self.toggle_wrap_action.setEnabled(enabled)
+        self.analytics_action.setEnabled(enabled)
 
     def show_settings_dialog(self):
         dialog = SettingsDialog(self)
@@ -381,42 +1122,295 @@ class MainWindow(QMainWindow):
             aai.settings.api_key = API_KEY
             QMessageBox.information(self, "Settings Updated", "API keys have been updated successfully!")
 
+    def show_glossary_dialog(self):
+        dialog = GlossaryDialog(config.get("glossary", []), config.get("glossary_auto_apply", True), self)
+        if dialog.exec_() == QDialog.Accepted:
+            entries, auto_apply = dialog.get_values()
+            config["glossary"] = entries
+            config["glossary_auto_apply"] = auto_apply
+            save_config(config)
+            self.glossary_matcher = GlossaryMatcher(entries)
+            self.status_bar.showMessage(f"Glossary saved ({len(entries)} terms).", 5000)
+
+    def apply_glossary(self):
+        if not self.glossary_matcher.rules:
+            QMessageBox.information(self, "Glossary", "The glossary is empty. Add terms via Edit > Glossary...")
+            return
+        text = self.text_edit.toPlainText()
+        matches = skip_transcript_labels(text, self.glossary_matcher.find(text))
+        apply_text_edits(self.text_edit.document(), text, matches)
+        self.status_bar.showMessage(f"Glossary applied: {len(matches)} corrections.", 5000)
+
     def search_and_replace(self):
-        search_text, replace_text, ok = SearchReplaceDialog.getValues(self)
-        if not ok:
+        if not self.search_dock:
+            self.search_dock = QDockWidget("Search and Replace", self)
+            self.search_dock.setAllowedAreas(Qt.BottomDockWidgetArea | Qt.TopDockWidgetArea)
+            self.search_widget = SearchReplaceWidget(self)
+            self.search_widget.searchChanged.connect(self.schedule_search)
+            self.search_widget.findNextRequested.connect(self.find_next)
+            self.search_widget.findPreviousRequested.connect(self.find_previous)
+            self.search_widget.replaceRequested.connect(self.replace_current)
+            self.search_widget.replaceAllRequested.connect(self.replace_all)
+            self.search_dock.setWidget(self.search_widget)
+            self.search_dock.visibilityChanged.connect(self.on_search_dock_visibility_changed)
+            self.addDockWidget(Qt.BottomDockWidgetArea, self.search_dock)
+        self.search_dock.show()
+        selected = self.text_edit.textCursor().selectedText()
+        if selected and "\u2029" not in selected:
+            self.search_widget.search_edit.setText(selected)
+        self.search_widget.focus_search()
+
+    def search_panel_active(self):
+        return bool(self.search_dock and self.search_dock.isVisible() and self.search_widget.getQuery())
+
+    def on_search_dock_visibility_changed(self, visible):
+        if visible:
+            self.schedule_search()
+        else:
+            self.cancel_search()
+            self.search_pattern = None
+            self.clear_search_matches()
+
+    def schedule_search(self):
+        self.search_timer.start(SEARCH_DEBOUNCE_MS)
+
+    def cancel_search(self):
+        self.search_timer.stop()
+        if self.search_worker and self.search_worker.isRunning():
+            self.search_worker.requestInterruption()
+        self.search_worker = None
+        self.search_running = False
+        self.pending_replace_all = False
+
+    def clear_search_matches(self):
+        self.search_matches = []
+        self.search_starts = []
+        self.current_match_index = -1
+        self.update_match_highlights()
+
+    def start_search(self):
+        self.cancel_search()
+        self.clear_search_matches()
+        self.search_pattern = None
+        if not self.search_panel_active():
+            if self.search_dock:
+                self.search_widget.set_status("")
+            return
+        try:
+            self.search_pattern = build_search_pattern(self.search_widget.getQuery(), **self.search_widget.getOptions())
+        except re.error as e:
+            self.search_widget.set_status(f"Invalid pattern: {e}")
             return
-        if not search_text:
-            QMessageBox.warning(self, "Input Error", "Search text cannot be empty.")
+        self.search_text = self.text_edit.toPlainText()
+        self.search_offsets = Utf16Offsets(self.search_text)
+        self.search_generation += 1
+        self.search_running = True
+        self.search_widget.set_status("Searching...")
+        self.search_worker = SearchWorker(self.search_generation, self.search_text, self.search_pattern, parent=self)
+        self.search_worker.matchesFound.connect(self.on_search_matches)
+        self.search_worker.searchFinished.connect(self.on_search_finished)
+        self.search_worker.finished.connect(self.search_worker.deleteLater)
+        self.search_worker.start()
+
+    def on_search_matches(self, generation, batch):
+        if generation != self.search_generation:
             return
-        content = self.text_edit.toPlainText()
-        self.text_edit.setPlainText(content.replace(search_text, replace_text))
-        QMessageBox.information(self, "Success", f"Replaced all occurrences of '{search_text}' with '{replace_text}'.")
+        self.search_matches.extend(batch)
+        self.search_starts.extend(start for start, _end in batch)
+        self.search_widget.set_status(f"Searching... {len(self.search_matches)} matches")
+        self.update_match_highlights()
+
+    def on_search_finished(self, generation, total):
+        if generation != self.search_generation:
+            return
+        self.search_running = False
+        self.search_worker = None
+        self.update_search_status()
+        if self.pending_replace_all:
+            self.pending_replace_all = False
+            self.replace_all()
+
+    def update_search_status(self):
+        count = len(self.search_matches)
+        if count == 0:
+            self.search_widget.set_status("No matches")
+        elif self.current_match_index >= 0:
+            self.search_widget.set_status(f"{self.current_match_index + 1} of {count} matches")
+        else:
+            self.search_widget.set_status(f"{count} matches")
+
+    def on_document_changed(self, position, chars_removed, chars_added):
+        if self.applying_replacement:
+            return
+        # Any outside edit invalidates the stored positions; re-search once typing settles.
+        if self.search_matches or self.search_running:
+            self.cancel_search()
+            self.clear_search_matches()
+        if self.search_panel_active():
+            self.schedule_search()
+
+    def update_match_highlights(self):
+        selections = []
+        if self.search_matches:
+            viewport = self.text_edit.viewport()
+            offsets = self.search_offsets
+            first = offsets.from_qt(self.text_edit.cursorForPosition(QPoint(0, 0)).position())
+            last = offsets.from_qt(
+                self.text_edit.cursorForPosition(QPoint(viewport.width() - 1, viewport.height() - 1)).position()
+            )
+            # Only highlight what is on screen; the rest is drawn as the view scrolls.
+            index = max(bisect_left(self.search_starts, first) - 1, 0)
+            match_format = QTextCharFormat()
+            match_format.setBackground(QColor("#fff59d"))
+            current_format = QTextCharFormat()
+            current_format.setBackground(QColor("#ffb74d"))
+            document = self.text_edit.document()
+            while index < len(self.search_matches) and len(selections) < MAX_VISIBLE_HIGHLIGHTS:
+                start, end = self.search_matches[index]
+                if start > last:
+                    break
+                selection = QTextEdit.ExtraSelection()
+                selection.cursor = QTextCursor(document)
+                selection.cursor.setPosition(offsets.to_qt(start))
+                selection.cursor.setPosition(offsets.to_qt(end), QTextCursor.KeepAnchor)
+                selection.format = current_format if index == self.current_match_index else match_format
+                selections.append(selection)
+                index += 1
+        self.text_edit.setExtraSelections(selections)
+
+    def select_match(self, index):
+        start, end = self.search_matches[index]
+        cursor = self.text_edit.textCursor()
+        cursor.setPosition(self.search_offsets.to_qt(start))
+        cursor.setPosition(self.search_offsets.to_qt(end), QTextCursor.KeepAnchor)
+        self.text_edit.setTextCursor(cursor)
+        self.text_edit.ensureCursorVisible()
+        self.current_match_index = index
+        self.update_match_highlights()
+        self.update_search_status()
+
+    def find_next(self):
+        if not self.search_dock or not self.search_dock.isVisible():
+            self.search_and_replace()
+            return
+        if not self.search_matches:
+            return
+        position = self.search_offsets.from_qt(self.text_edit.textCursor().selectionEnd())
+        index = bisect_left(self.search_starts, position)
+        self.select_match(index if index < len(self.search_matches) else 0)
+
+    def find_previous(self):
+        if not self.search_dock or not self.search_dock.isVisible():
+            self.search_and_replace()
+            return
+        if not self.search_matches:
+            return
+        position = self.search_offsets.from_qt(self.text_edit.textCursor().selectionStart())
+        index = bisect_left(self.search_starts, position) - 1
+        self.select_match(index if index >= 0 else len(self.search_matches) - 1)
+
+    def expand_replacement(self, start, end, template):
+        if not self.search_widget.getOptions()["use_regex"]:
+            return template
+        # Match against the full snapshot so anchors and lookarounds see their real context.
+        match = self.search_pattern.match(self.search_text, start)
+        if match is None or match.end() != end:
+            return template
+        return match.expand(template)
+
+    def replace_current(self):
+        if not self.search_matches:
+            return
+        index = self.current_match_index
+        cursor = self.text_edit.textCursor()
+        selection = (self.search_offsets.from_qt(cursor.selectionStart()), self.search_offsets.from_qt(cursor.selectionEnd()))
+        if index < 0 or selection != self.search_matches[index]:
+            # Like most editors, the first press selects the match and the next one replaces it.
+            self.find_next()
+            return
+        start, end = self.search_matches[index]
+        try:
+            replacement = self.expand_replacement(start, end, self.search_widget.getReplacement())
+        except re.error as e:
+            self.search_widget.set_status(f"Invalid replacement: {e}")
+            return
+        self.applying_replacement = True
+        cursor.insertText(replacement)  # A single cursor edit, so Ctrl+Z undoes exactly this replacement.
+        self.applying_replacement = False
+        if self.search_running:
+            # Positions still streaming from the worker would be off by the edit; start over.
+            self.start_search()
+            return
+        delta = len(replacement) - (end - start)
+        self.search_text = self.search_text[:start] + replacement + self.search_text[end:]
+        self.search_offsets = Utf16Offsets(self.search_text)
+        del self.search_matches[index]
+        del self.search_starts[index]
+        for i in range(index, len(self.search_matches)):
+            match_start, match_end = self.search_matches[i]
+            self.search_matches[i] = (match_start + delta, match_end + delta)
+            self.search_starts[i] = match_start + delta
+        self.current_match_index = -1
+        if self.search_matches:
+            self.select_match(index if index < len(self.search_matches) else 0)
+        else:
+            self.update_match_highlights()
+            self.update_search_status()
+
+    def replace_all(self):
+        if self.search_running:
+            self.pending_replace_all = True
+            self.search_widget.set_status("Replacing once the search completes...")
+            return
+        if not self.search_matches:
+            return
+        template = self.search_widget.getReplacement()
+        try:
+            edits = [(start, end, self.expand_replacement(start, end, template)) for start, end in self.search_matches]
+        except re.error as e:
+            self.search_widget.set_status(f"Invalid replacement: {e}")
+            return
+        self.applying_replacement = True
+        apply_text_edits(self.text_edit.document(), self.search_text, edits)
+        self.applying_replacement = False
+        self.status_bar.showMessage(f"Replaced {len(edits)} occurrences.", 5000)
+        self.start_search()
 
     def open_audio_file(self):
         file_path, _ = QFileDialog.getOpenFileName(self, "Open Audio File", "", "Audio Files (*.mp3 *.wav *.ogg)")
         if file_path:
             self.set_ui_enabled(False)
             self.start_progress("Uploading file...")
-            self.status_timer.start(2000)
-            self.transcription_thread = TranscriptionThread(file_path)
+            glossary = config.get("glossary", [])
+            self.transcription_thread = TranscriptionThread(
+                file_path,
+                word_boost=glossary_word_boost(glossary),
+                glossary=self.glossary_matcher if config.get("glossary_auto_apply", True) else None,
+            )
+            self.transcription_thread.upload_progress.connect(self.on_upload_progress)
+            self.transcription_thread.status_changed.connect(self.status_bar.showMessage)
             self.transcription_thread.transcription_finished.connect(self.on_transcription_finished)
             self.transcription_thread.error_occurred.connect(self.on_transcription_error)
             self.transcription_thread.start()
 
-    def update_transcribing_status(self):
-        if self.transcription_thread and self.transcription_thread.isRunning():
-            self.status_bar.showMessage("Transcribing file...")
+    def on_upload_progress(self, sent, total):
+        if total > 0 and sent >= total:
+            self.start_progress("Transcribing file...")
+            return
+        self.progress.setRange(0, 100)
+        self.progress.setValue(int(sent * 100 / total) if total else 0)
+        self.status_bar.showMessage(f"Uploading file... {format_bytes(sent)} of {format_bytes(total)}")
 
     def on_transcription_finished(self, result):
         # result is a tuple: (plain transcript text, transcript object)
-        if self.status_timer.isActive():
-            self.status_timer.stop()
         self.stop_progress("Transcription complete!")
         self.set_ui_enabled(True)
         transcript_text, transcript_obj = result
         self.last_transcript = transcript_obj
         self.plain_transcript_text = transcript_text
         self.timestamps_applied = False
+        self.speaker_names = {}
+        self.store_in_library()
         self.text_edit.setPlainText(transcript_text)
         speakers = set(re.findall(r"(Speaker\s+[A-Z0-9]+):", transcript_text))
         print("Detected Speakers:", speakers)
@@ -424,8 +1418,6 @@ class MainWindow(QMainWindow):
             self.show_speaker_mapping_panel(sorted(speakers))
 
     def on_transcription_error(self, error_message):
-        if self.status_timer.isActive():
-            self.status_timer.stop()
         self.stop_progress("Transcription failed.")
         self.set_ui_enabled(True)
         QMessageBox.critical(self, "Transcription Failed", f"An error occurred: {error_message}")
@@ -553,11 +1545,8 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "Error", "No transcript data available.")
             return
         if not self.timestamps_applied:
-            new_text = ""
-            for utt in self.last_transcript.utterances:
-                sec_time = utt.start / 1000.0  # Convert ms to s.
-                ts = seconds_to_hhmmss(sec_time)
-                new_text += f"[{ts}] Speaker {utt.speaker}: {utt.text}\n"
+            glossary = self.glossary_matcher if config.get("glossary_auto_apply", True) else None
+            new_text = format_utterances(self.last_transcript.utterances, glossary, with_timestamps=True)
             self.text_edit.setPlainText(new_text)
             self.timestamps_applied = True
             self.mapping_widget.apply_timestamps_button.setText("Remove Timestamps")
@@ -571,8 +1560,71 @@ class MainWindow(QMainWindow):
         for speaker_label, real_name in mapping.items():
             content = content.replace(speaker_label, real_name)
         self.text_edit.setPlainText(content)
+        self.speaker_names.update(mapping)
+        self.store_in_library()
+        if self.analytics_dock and self.analytics_dock.isVisible():
+            self.show_current_analytics()
         QMessageBox.information(self, "Speaker Mapping", "Speaker names have been updated.")
 
+    def store_in_library(self):
+        if not self.last_transcript or not self.last_transcript.utterances:
+            return
+        try:
+            save_library_transcript(
+                self.last_transcript.id, utterance_columns(self.last_transcript.utterances), self.speaker_names
+            )
+        except OSError as e:
+            self.status_bar.showMessage(f"Could not store transcript for analytics: {e}", 5000)
+
+    def show_analytics_panel(self):
+        if not self.analytics_dock:
+            self.analytics_dock = QDockWidget("Speaker Analytics", self)
+            self.analytics_dock.setAllowedAreas(Qt.RightDockWidgetArea | Qt.LeftDockWidgetArea)
+            self.analytics_widget = SpeakerAnalyticsWidget(self)
+            self.analytics_widget.currentRequested.connect(self.show_current_analytics)
+            self.analytics_widget.libraryRequested.connect(self.show_library_analytics)
+            self.analytics_dock.setWidget(self.analytics_widget)
+            self.addDockWidget(Qt.LeftDockWidgetArea, self.analytics_dock)
+        self.analytics_dock.show()
+
+    def show_current_analytics(self):
+        self.show_analytics_panel()
+        if not self.last_transcript or not self.last_transcript.utterances:
+            self.analytics_widget.set_scope("No transcript data available.")
+            self.analytics_widget.show_stats([])
+            return
+        self.analytics_widget.set_scope("Current transcript")
+        self.analytics_widget.show_stats(transcript_speaker_stats(self.last_transcript.utterances, self.speaker_names))
+
+    def show_library_analytics(self):
+        self.show_analytics_panel()
+        if self.library_worker and self.library_worker.isRunning():
+            return
+        self.analytics_widget.set_scope("Analyzing transcript library...")
+        self.analytics_widget.library_button.setEnabled(False)
+        self.library_worker = LibraryAnalyticsWorker()
+        self.library_worker.statsReady.connect(self.on_library_stats_ready)
+        self.library_worker.errorOccurred.connect(self.on_library_stats_error)
+        self.library_worker.start()
+
+    def on_library_stats_ready(self, stats, skipped):
+        self.analytics_widget.library_button.setEnabled(True)
+        scope = f"Whole library ({TRANSCRIPT_LIBRARY_DIR}/)"
+        if skipped:
+            scope += f", {len(skipped)} unreadable file(s) skipped"
+            self.analytics_widget.scope_label.setToolTip(
+                "\n".join(f"{file_name}: {reason}" for file_name, reason in skipped)
+            )
+        else:
+            self.analytics_widget.scope_label.setToolTip("")
+        self.analytics_widget.set_scope(scope)
+        self.analytics_widget.show_stats(stats)
+
+    def on_library_stats_error(self, error_message):
+        self.analytics_widget.library_button.setEnabled(True)
+        self.analytics_widget.set_scope("")
+        QMessageBox.critical(self, "Analytics Error", f"An error occurred: {error_message}")
+
 if __name__ == "__main__":
     app = QApplication(sys.argv)
     window = MainWindow()
@@ -0,0 +1,428 @@
+"""Offline load test for RizzScript.
+
+Starts local stand-ins for the AssemblyAI and OpenAI endpoints the app uses,
+points the SDKs at them and pushes concurrent jobs through the real
+TranscriptionThread and MappingWorker classes. No network access is needed.
+
+Example:
+    python loadtest.py --jobs 50 --concurrency 10 --latency-ms 80 --error-rate 0.02 --rate-limit-rate 0.05
+"""
+import argparse
+import json
+import math
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# ----------------------------
+# Fault Injection and Payloads
+# ----------------------------
+
+WORD_POOL = (
+    "the project timeline looks good but we still need to review the budget numbers before "
+    "friday and I think marketing wants another pass on the launch plan so let's schedule "
+    "a follow up call with the team to go over the open questions and action items"
+).split()
+
+FAKE_NAMES = ["Alice", "Bob", "Carol", "Dan", "Erin", "Frank", "Grace", "Heidi", "Ivan", "Judy"]
+
+class FaultInjector:
+    def __init__(self, latency_ms=50, jitter_ms=0, error_rate=0.0, rate_limit_rate=0.0, seed=None):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.stats = Counter()
+
+    def delay(self):
+        with self.lock:
+            jitter = self.random.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0
+        time.sleep(max(self.latency_ms + jitter, 0) / 1000.0)
+
+    def pick_fault(self, endpoint):
+        # Returns None, 429 or 500 for the current request.
+        with self.lock:
+            self.stats[f"{endpoint} requests"] += 1
+            roll = self.random.random()
+            if roll < self.rate_limit_rate:
+                self.stats[f"{endpoint} 429"] += 1
+                return 429
+            if roll < self.rate_limit_rate + self.error_rate:
+                self.stats[f"{endpoint} 500"] += 1
+                return 500
+        return None
+
+    def count(self, key, amount=1):
+        with self.lock:
+            self.stats[key] += amount
+
+def make_utterances(num_utterances, num_speakers, words_per_utterance, seed=None):
+    rng = random.Random(seed)
+    speakers = [chr(ord("A") + i) for i in range(num_speakers)]
+    utterances = []
+    clock_ms = 0
+    for i in range(num_utterances):
+        speaker = speakers[i % num_speakers] if i < num_speakers else rng.choice(speakers)
+        words = []
+        start_ms = clock_ms
+        for _ in range(max(1, int(rng.gauss(words_per_utterance, words_per_utterance / 3)))):
+            duration = rng.randint(150, 450)
+            words.append({
+                "text": rng.choice(WORD_POOL),
+                "start": clock_ms,
+                "end": clock_ms + duration,
+                "confidence": round(rng.uniform(0.8, 1.0), 3),
+                "speaker": speaker,
+            })
+            clock_ms += duration + rng.randint(0, 80)
+        utterances.append({
+            "speaker": speaker,
+            "text": " ".join(word["text"] for word in words).capitalize() + ".",
+            "start": start_ms,
+            "end": words[-1]["end"],
+            "confidence": round(sum(word["confidence"] for word in words) / len(words), 3),
+            "words": words,
+        })
+        clock_ms += rng.randint(100, 900)
+    return utterances
+
+def make_transcript(transcript_id, audio_url, status, utterances):
+    payload = {
+        "id": transcript_id,
+        "status": status,
+        "audio_url": audio_url,
+        "speaker_labels": True,
+        "language_code": "en_us",
+        "error": None,
+        "text": None,
+        "words": None,
+        "utterances": None,
+        "confidence": None,
+        "audio_duration": None,
+    }
+    if status == "completed":
+        words = [word for utterance in utterances for word in utterance["words"]]
+        payload.update({
+            "text": " ".join(utterance["text"] for utterance in utterances),
+            "words": words,
+            "utterances": utterances,
+            "confidence": round(sum(word["confidence"] for word in words) / len(words), 3) if words else 1.0,
+            "audio_duration": (utterances[-1]["end"] // 1000) if utterances else 0,
+        })
+    return payload
+
+# ----------------------------
+# Fake Servers
+# ----------------------------
+class FakeServiceHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass  # Keep the report readable.
+
+    def read_body(self):
+        if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+            body = bytearray()
+            while True:
+                size = int(self.rfile.readline().split(b";")[0].strip() or b"0", 16)
+                if size == 0:
+                    self.rfile.readline()
+                    break
+                body += self.rfile.read(size)
+                self.rfile.readline()
+            return bytes(body)
+        return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+    def send_json(self, status, payload, headers=None):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def send_fault(self, fault):
+        if fault == 429:
+            self.send_json(429, {"error": "Too Many Requests"}, {"Retry-After": "1"})
+        else:
+            self.send_json(500, {"error": "Injected server error"})
+
+    def route(self):
+        # Accept SDKs whose base URL does or does not already include the version prefix.
+        path = self.path.split("?", 1)[0]
+        while path.startswith(("/v2/", "/v1/")):
+            path = path[3:]
+        return path
+
+class FakeAssemblyAIHandler(FakeServiceHandler):
+    # self.server carries: faults, utterances, polls_before_complete, transcripts, lock.
+    def do_POST(self):
+        body = self.read_body()
+        path = self.route()
+        self.server.faults.delay()
+        if path == "/upload":
+            fault = self.server.faults.pick_fault("upload")
+            if fault:
+                return self.send_fault(fault)
+            self.server.faults.count("uploaded bytes", len(body))
+            return self.send_json(200, {"upload_url": f"http://{self.headers.get('Host')}/files/{uuid.uuid4().hex}"})
+        if path == "/transcript":
+            fault = self.server.faults.pick_fault("submit")
+            if fault:
+                return self.send_fault(fault)
+            request = json.loads(body or b"{}")
+            transcript_id = uuid.uuid4().hex
+            with self.server.lock:
+                self.server.transcripts[transcript_id] = {"audio_url": request.get("audio_url"), "polls": 0}
+            return self.send_json(200, make_transcript(transcript_id, request.get("audio_url"), "queued", None))
+        self.send_json(404, {"error": f"Unknown endpoint {self.path}"})
+
+    def do_GET(self):
+        path = self.route()
+        self.server.faults.delay()
+        if path.startswith("/transcript/"):
+            transcript_id = path.rsplit("/", 1)[-1]
+            fault = self.server.faults.pick_fault("poll")
+            if fault:
+                return self.send_fault(fault)
+            with self.server.lock:
+                job = self.server.transcripts.get(transcript_id)
+                if job is not None:
+                    job["polls"] += 1
+            if job is None:
+                return self.send_json(404, {"error": "Transcript not found"})
+            status = "completed" if job["polls"] > self.server.polls_before_complete else "processing"
+            return self.send_json(200, make_transcript(transcript_id, job["audio_url"], status, self.server.utterances))
+        self.send_json(404, {"error": f"Unknown endpoint {self.path}"})
+
+class FakeOpenAIHandler(FakeServiceHandler):
+    def do_POST(self):
+        body = self.read_body()
+        path = self.route()
+        self.server.faults.delay()
+        if path != "/chat/completions":
+            return self.send_json(404, {"error": {"message": f"Unknown endpoint {self.path}"}})
+        fault = self.server.faults.pick_fault("chat")
+        if fault:
+            return self.send_fault(fault)
+        request = json.loads(body or b"{}")
+        prompt = request.get("messages", [{}])[-1].get("content", "")
+        speakers = sorted(set(part.split(":")[0] for part in prompt.splitlines() if part.startswith("Speaker ")))
+        mapping = {speaker: FAKE_NAMES[i % len(FAKE_NAMES)] for i, speaker in enumerate(speakers)}
+        self.send_json(200, {
+            "id": f"chatcmpl-{uuid.uuid4().hex}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "o1"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": json.dumps(mapping)},
+                "finish_reason": "stop",
+            }],
+            "usage": {"prompt_tokens": len(prompt.split()), "completion_tokens": len(mapping) * 4,
+                      "total_tokens": len(prompt.split()) + len(mapping) * 4},
+        })
+
+def start_server(handler, faults, **attributes):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    server.faults = faults
+    server.lock = threading.Lock()
+    for key, value in attributes.items():
+        setattr(server, key, value)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+# ----------------------------
+# Load Driver
+# ----------------------------
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    # Nearest-rank: the smallest value with at least pct percent of the values at or below it.
+    index = max(math.ceil(pct / 100.0 * len(sorted_values)) - 1, 0)
+    return sorted_values[min(index, len(sorted_values) - 1)]
+
+def build_driver(app_module):
+    from PyQt5.QtCore import QObject, QCoreApplication
+
+    class LoadTestDriver(QObject):
+        def __init__(self, audio_path, jobs, concurrency, with_mapping, reuse_uploads):
+            super().__init__()
+            self.audio_path = audio_path
+            self.reuse_uploads = reuse_uploads
+            self.remaining = jobs
+            self.concurrency = concurrency
+            self.with_mapping = with_mapping
+            self.active = {}   # Thread -> (job number, stage start time, job start time)
+            self.results = []  # (job number, ok, seconds, error)
+            self.upload_retries = Counter()  # Job number -> upload retries reported by TranscriptionThread.
+            self.stage_times = {"transcription": [], "mapping": []}
+            self.started_at = None
+
+        def start(self):
+            self.started_at = time.monotonic()
+            for _ in range(min(self.concurrency, self.remaining)):
+                self.start_next_job()
+
+        def start_next_job(self):
+            if self.remaining <= 0:
+                if not self.active:
+                    QCoreApplication.instance().quit()
+                return
+            self.remaining -= 1
+            job_number = len(self.results) + len(self.active) + 1
+            thread = app_module.TranscriptionThread(self.audio_path, use_upload_cache=self.reuse_uploads)
+            thread.transcription_finished.connect(self.on_transcription_finished)
+            thread.error_occurred.connect(self.on_error)
+            thread.status_changed.connect(self.on_status_changed)
+            now = time.monotonic()
+            self.active[thread] = (job_number, now, now)
+            thread.start()
+
+        def on_status_changed(self, message):
+            if message.startswith("Upload interrupted"):
+                self.upload_retries[self.active[self.sender()][0]] += 1
+
+        def finish_stage(self, stage):
+            thread = self.sender()
+            job_number, stage_started, job_started = self.active.pop(thread)
+            thread.wait()
+            self.stage_times[stage].append(time.monotonic() - stage_started)
+            return job_number, job_started
+
+        def complete_job(self, job_number, job_started, ok, error=""):
+            self.results.append((job_number, ok, time.monotonic() - job_started, error))
+            self.start_next_job()
+
+        def on_transcription_finished(self, result):
+            job_number, job_started = self.finish_stage("transcription")
+            transcript_text, _transcript = result
+            if not self.with_mapping:
+                self.complete_job(job_number, job_started, True)
+                return
+            prompt = f"Full Transcript:\n{transcript_text}\n\nOutput the result as a valid JSON object only."
+            worker = app_module.MappingWorker(prompt)
+            worker.mappingReady.connect(self.on_mapping_ready)
+            worker.errorOccurred.connect(self.on_error)
+            self.active[worker] = (job_number, time.monotonic(), job_started)
+            worker.start()
+
+        def on_mapping_ready(self, result_text):
+            job_number, job_started = self.finish_stage("mapping")
+            try:
+                app_module.extract_json(result_text)
+            except Exception as e:
+                self.complete_job(job_number, job_started, False, f"Bad mapping JSON: {e}")
+                return
+            self.complete_job(job_number, job_started, True)
+
+        def on_error(self, error_message):
+            thread = self.sender()
+            job_number, _stage_started, job_started = self.active.pop(thread)
+            thread.wait()
+            self.complete_job(job_number, job_started, False, error_message)
+
+    return LoadTestDriver
+
+def print_report(driver, faults, elapsed):
+    latencies = sorted(seconds for _job, ok, seconds, _error in driver.results if ok)
+    failures = [(job, error) for job, ok, _seconds, error in driver.results if not ok]
+    print(f"Jobs: {len(driver.results)}  succeeded: {len(latencies)}  failed: {len(failures)}")
+    print(f"Wall time: {elapsed:.2f}s  throughput: {len(latencies) / elapsed if elapsed else 0:.2f} jobs/s")
+    if latencies:
+        print("End-to-end latency: p50 {:.3f}s  p95 {:.3f}s  p99 {:.3f}s  max {:.3f}s".format(
+            percentile(latencies, 50), percentile(latencies, 95), percentile(latencies, 99), latencies[-1]))
+    for stage, times in driver.stage_times.items():
+        if times:
+            times = sorted(times)
+            print("  {}: n={}  p50 {:.3f}s  p95 {:.3f}s  p99 {:.3f}s".format(
+                stage, len(times), percentile(times, 50), percentile(times, 95), percentile(times, 99)))
+    injected = sum(count for key, count in faults.stats.items() if key.endswith((" 429", " 500")))
+    print(f"Faults injected by the fake servers: {injected}")
+    retried_jobs = set(driver.upload_retries)
+    recovered_jobs = retried_jobs & {job for job, ok, _seconds, _error in driver.results if ok}
+    print(f"Upload retries: {sum(driver.upload_retries.values())} across {len(retried_jobs)} jobs, "
+          f"{len(recovered_jobs)} of which still succeeded")
+    for key in sorted(faults.stats):
+        print(f"  {key}: {faults.stats[key]}")
+    if failures:
+        print("Errors:")
+        for error, count in Counter(error for _job, error in failures).most_common():
+            print(f"  {count} x {error}")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Offline load test for RizzScript against fake AssemblyAI/OpenAI servers.")
+    parser.add_argument("--jobs", type=int, default=20, help="Total number of jobs to run.")
+    parser.add_argument("--concurrency", type=int, default=5, help="Jobs in flight at once.")
+    parser.add_argument("--no-mapping", action="store_true", help="Skip the OpenAI speaker-mapping stage.")
+    parser.add_argument("--latency-ms", type=float, default=50, help="Added latency per request.")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="Random +/- jitter on the latency.")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with HTTP 500.")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Fraction of requests answered with HTTP 429.")
+    parser.add_argument("--utterances", type=int, default=200, help="Utterances in the canned transcript.")
+    parser.add_argument("--speakers", type=int, default=3, help="Distinct speakers in the canned transcript.")
+    parser.add_argument("--words-per-utterance", type=int, default=20, help="Average words per utterance.")
+    parser.add_argument("--reuse-uploads", action="store_true",
+                        help="Let jobs reuse a cached upload URL instead of uploading the file every time.")
+    parser.add_argument("--upload-bytes", type=int, default=1024 * 1024, help="Size of the generated audio file.")
+    parser.add_argument("--polls", type=int, default=2, help="Polls answered 'processing' before a transcript completes.")
+    parser.add_argument("--poll-interval", type=float, default=0.1, help="SDK polling interval in seconds.")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for repeatable payloads and faults.")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    faults = FaultInjector(args.latency_ms, args.jitter_ms, args.error_rate, args.rate_limit_rate, args.seed)
+    utterances = make_utterances(args.utterances, args.speakers, args.words_per_utterance, args.seed)
+    assemblyai_server = start_server(FakeAssemblyAIHandler, faults, utterances=utterances,
+                                     polls_before_complete=args.polls, transcripts={})
+    openai_server = start_server(FakeOpenAIHandler, faults)
+
+    cwd = os.getcwd()
+    workdir = tempfile.mkdtemp(prefix="rizzscript-loadtest-")
+    try:
+        audio_path = os.path.join(workdir, "loadtest.wav")
+        with open(audio_path, "wb") as f:
+            f.write(os.urandom(args.upload_bytes))
+
+        # app.py creates config.json in the working directory on import; keep it out of the user's one.
+        sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+        os.chdir(workdir)
+        import app as app_module
+        import assemblyai as aai
+        from PyQt5.QtCore import QCoreApplication, QTimer
+
+        aai.settings.api_key = "loadtest"
+        aai.settings.base_url = f"http://127.0.0.1:{assemblyai_server.server_address[1]}"
+        aai.settings.polling_interval = args.poll_interval
+        app_module.OPENAI_API_KEY = "loadtest"
+        app_module.OPENAI_BASE_URL = f"http://127.0.0.1:{openai_server.server_address[1]}/v1"
+
+        qt_app = QCoreApplication.instance() or QCoreApplication(sys.argv[:1])
+        driver = build_driver(app_module)(audio_path, args.jobs, args.concurrency, not args.no_mapping,
+                                        args.reuse_uploads)
+        QTimer.singleShot(0, driver.start)
+        qt_app.exec_()
+        elapsed = time.monotonic() - driver.started_at
+        print_report(driver, faults, elapsed)
+    finally:
+        assemblyai_server.shutdown()
+        openai_server.shutdown()
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+    return 0 if len(driver.results) == args.jobs else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
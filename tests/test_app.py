@@ -0,0 +1,231 @@
+import importlib
+import os
+import sys
+import types
+
+import pytest
+
+for dependency in ("PyQt5", "assemblyai", "openai", "httpx", "numpy"):
+    pytest.importorskip(dependency)
+
+import assemblyai as aai
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+@pytest.fixture(scope="module")
+def app(tmp_path_factory):
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    # app.py creates config.json in the working directory on import.
+    cwd = os.getcwd()
+    os.chdir(tmp_path_factory.mktemp("config"))
+    sys.path.insert(0, ROOT)
+    try:
+        module = importlib.import_module("app")
+    finally:
+        os.chdir(cwd)
+    from PyQt5.QtWidgets import QApplication
+    module.qt_app = QApplication.instance() or QApplication([])
+    return module
+
+def run_search(app, text, pattern, chunk_size):
+    found = []
+    worker = app.SearchWorker(1, text, pattern, chunk_size=chunk_size)
+    worker.matchesFound.connect(lambda _generation, batch: found.extend(batch))
+    worker.run()  # Synchronously, on this thread.
+    return found
+
+# ----------------------------
+# Search and Replace
+# ----------------------------
+
+def test_utf16_offsets_round_trip(app):
+    text = "😀 foo 🎉🎉 bar"
+    offsets = app.Utf16Offsets(text)
+    assert [offsets.to_qt(i) for i in (0, 1, 2, 6, 7, 8, 9)] == [0, 2, 3, 7, 9, 11, 12]
+    for position in range(len(text) + 1):
+        assert offsets.from_qt(offsets.to_qt(position)) == position
+
+def test_replace_all_with_non_bmp_text(app):
+    from PyQt5.QtGui import QTextDocument
+    text = "😀 foo bar foo\nfoo end\n"
+    document = QTextDocument()
+    document.setPlainText(text)
+    pattern = app.build_search_pattern("foo")
+    edits = [(start, end, "X") for start, end in run_search(app, text, pattern, app.SEARCH_CHUNK_SIZE)]
+    app.apply_text_edits(document, document.toPlainText(), edits)
+    assert document.toPlainText() == "😀 X bar X\nX end\n"
+    document.undo()
+    assert document.toPlainText() == text
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 7, 64])
+def test_search_worker_chunks_match_full_scan(app, monkeypatch, chunk_size):
+    monkeypatch.setattr(app, "SEARCH_OVERLAP", 2)
+    text = "foobar foo xfoo foo_ foo. " * 20 + "aaaaaaaaaaaa end"
+    for query, options in (("foo", {"whole_word": True}), ("a+", {"use_regex": True}), ("o b", {})):
+        pattern = app.build_search_pattern(query, **options)
+        expected = [match.span() for match in pattern.finditer(text) if match.start() != match.end()]
+        assert run_search(app, text, pattern, chunk_size) == expected
+
+# ----------------------------
+# Uploads
+# ----------------------------
+
+def make_utterance(speaker, text, start=0):
+    return types.SimpleNamespace(speaker=speaker, text=text, start=start)
+
+class FakeTranscriber:
+    # Stands in for aai.Transcriber: transcripts of URLs in `stale` come back with an error.
+    stale = set()
+    requested = []
+    utterances = []
+
+    def transcribe(self, audio_url, config=None):
+        FakeTranscriber.requested.append(audio_url)
+        if audio_url in FakeTranscriber.stale:
+            return types.SimpleNamespace(status=aai.TranscriptStatus.error, error="Download error", utterances=None)
+        return types.SimpleNamespace(status=aai.TranscriptStatus.completed, error=None,
+                                     utterances=FakeTranscriber.utterances)
+
+@pytest.fixture
+def transcription(app, monkeypatch, tmp_path):
+    # Runs TranscriptionThread synchronously against FakeTranscriber; uploads return fresh-N URLs.
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(app.aai, "Transcriber", FakeTranscriber)
+    FakeTranscriber.stale = set()
+    FakeTranscriber.requested = []
+    FakeTranscriber.utterances = [make_utterance("A", "hello")]
+    uploads = []
+
+    def fake_upload(thread):
+        uploads.append(thread.file_path)
+        return f"fresh-{len(uploads)}"
+
+    monkeypatch.setattr(app.TranscriptionThread, "upload_with_retry", fake_upload)
+    audio_path = tmp_path / "audio.wav"
+    audio_path.write_bytes(b"audio")
+
+    def run(glossary=None):
+        results, errors = [], []
+        thread = app.TranscriptionThread(str(audio_path), glossary=glossary)
+        thread.transcription_finished.connect(results.append)
+        thread.error_occurred.connect(errors.append)
+        thread.run()
+        return results, errors
+
+    return types.SimpleNamespace(run=run, uploads=uploads, path=str(audio_path))
+
+def test_upload_cache_hit_skips_upload(app, transcription):
+    app.remember_upload_url(transcription.path, "cached-url")
+    results, errors = transcription.run()
+    assert errors == [] and len(results) == 1
+    assert transcription.uploads == []
+    assert FakeTranscriber.requested == ["cached-url"]
+
+def test_upload_cache_entries_expire(app, transcription, monkeypatch):
+    app.remember_upload_url(transcription.path, "cached-url")
+    now = app.time.time()
+    monkeypatch.setattr(app.time, "time", lambda: now + app.UPLOAD_URL_MAX_AGE + 1)
+    assert app.get_cached_upload_url(transcription.path) is None
+    transcription.run()
+    assert FakeTranscriber.requested == ["fresh-1"]
+
+def test_stale_cached_upload_is_replaced_in_the_same_run(app, transcription):
+    app.remember_upload_url(transcription.path, "cached-url")
+    FakeTranscriber.stale = {"cached-url"}
+    results, errors = transcription.run()
+    assert errors == [] and len(results) == 1
+    assert FakeTranscriber.requested == ["cached-url", "fresh-1"]
+    assert app.get_cached_upload_url(transcription.path) == "fresh-1"
+
+def test_failed_transcript_forgets_upload(app, transcription):
+    FakeTranscriber.stale = {"fresh-1"}
+    results, errors = transcription.run()
+    assert results == [] and errors == ["Download error"]
+    assert FakeTranscriber.requested == ["fresh-1"]  # A fresh upload is not retried.
+    assert app.get_cached_upload_url(transcription.path) is None
+
+def test_upload_streams_chunks_and_retries_rate_limits(app, monkeypatch, tmp_path):
+    import loadtest
+
+    class FirstTwoRateLimited(loadtest.FaultInjector):
+        def pick_fault(self, endpoint):
+            self.count(f"{endpoint} requests")
+            return 429 if self.stats[f"{endpoint} requests"] <= 2 else None
+
+    faults = FirstTwoRateLimited(latency_ms=0)
+    server = loadtest.start_server(loadtest.FakeAssemblyAIHandler, faults, utterances=[],
+                                   polls_before_complete=0, transcripts={})
+    sleeps = []
+    # time.sleep is shared with the fake server, whose zero-latency delays are ignored below.
+    monkeypatch.setattr(app.time, "sleep", lambda seconds: seconds and sleeps.append(seconds))
+    monkeypatch.setattr(app, "UPLOAD_CHUNK_SIZE", 4)
+    monkeypatch.setattr(app.aai.settings, "base_url", f"http://127.0.0.1:{server.server_address[1]}")
+    monkeypatch.setattr(app.aai.settings, "api_key", "test")
+    audio_path = tmp_path / "audio.wav"
+    audio_path.write_bytes(b"0123456789")
+    try:
+        progress, statuses = [], []
+        thread = app.TranscriptionThread(str(audio_path), use_upload_cache=False)
+        thread.upload_progress.connect(lambda sent, total: progress.append((sent, total)))
+        thread.status_changed.connect(statuses.append)
+        upload_url = thread.upload_with_retry()
+    finally:
+        server.shutdown()
+    assert upload_url.startswith("http://127.0.0.1:")
+    assert faults.stats["upload requests"] == 3
+    assert faults.stats["uploaded bytes"] == 10
+    assert len(sleeps) == 2 and all(delay >= 1 for delay in sleeps)  # Honours Retry-After: 1.
+    assert len(statuses) == 2 and statuses[0].startswith("Upload interrupted")
+    assert progress[-3:] == [(4, 10), (8, 10), (10, 10)]
+
+# ----------------------------
+# Speaker Analytics
+# ----------------------------
+
+def test_library_stats_report_skipped_files(app, tmp_path, capsys):
+    app.save_library_transcript(
+        "good", {"speakers": ["A", "B"], "start": [0, 1000], "end": [1000, 3000], "words": [2, 4]},
+        {"Speaker A": "Alice"}, library_dir=str(tmp_path),
+    )
+    (tmp_path / "broken.json").write_text("{not json")
+    (tmp_path / "list.json").write_text("[1, 2]")
+    stats, skipped = app.library_speaker_stats(str(tmp_path))
+    assert [entry["speaker"] for entry in stats] == ["Speaker B", "Alice"]
+    assert skipped[0][0] == "broken.json"
+    assert skipped[1] == ("list.json", "not a transcript object")
+    assert len(skipped) == 2
+    assert capsys.readouterr().out == ""
+
+# ----------------------------
+# Glossary Corrections
+# ----------------------------
+
+def test_glossary_corrections_with_non_bmp_text(app):
+    from PyQt5.QtGui import QTextDocument
+    text = "Speaker A: 😀 hello acme world, Acme and acmes"
+    document = QTextDocument()
+    document.setPlainText(text)
+    matcher = app.GlossaryMatcher([{"wrong": "acme", "right": "ACME"}])
+    app.apply_text_edits(document, document.toPlainText(), matcher.find(text))
+    assert document.toPlainText() == "Speaker A: 😀 hello ACME world, ACME and acmes"
+    assert document.toPlainText() == matcher.apply(text)[0]
+    document.undo()
+    assert document.toPlainText() == text
+
+def test_glossary_never_rewrites_speaker_labels(app, transcription):
+    matcher = app.GlossaryMatcher([{"wrong": "a", "right": "uh"}, {"wrong": "c", "right": "C#"}])
+    FakeTranscriber.utterances = [make_utterance("A", "a speaker", 0), make_utterance("C", "c code", 61000)]
+    results, errors = transcription.run(glossary=matcher)
+    assert errors == []
+    transcript_text = results[0][0]
+    assert transcript_text == "Speaker A: uh speaker\nSpeaker C: C# code\n"
+    assert app.format_utterances(FakeTranscriber.utterances, matcher, with_timestamps=True) == (
+        "[00:00:00] Speaker A: uh speaker\n[00:01:01] Speaker C: C# code\n"
+    )
+
+def test_on_demand_glossary_skips_speaker_labels(app):
+    text = "[00:00:01] Speaker C: c code\nSpeaker A: a c\n"
+    matcher = app.GlossaryMatcher([{"wrong": "c", "right": "C#"}, {"wrong": "00", "right": "zero", "whole_word": False}])
+    matches = app.skip_transcript_labels(text, matcher.find(text))
+    assert [text[start:end] for start, end, _replacement in matches] == ["c", "c"]
+    assert [start for start, _end, _replacement in matches] == [text.index("c code"), text.rindex("c")]
@@ -0,0 +1,30 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import loadtest
+
+def test_percentile_nearest_rank():
+    values = list(range(1, 101))
+    assert loadtest.percentile(values, 50) == 50
+    assert loadtest.percentile(values, 95) == 95
+    assert loadtest.percentile(values, 99) == 99
+    assert loadtest.percentile([7], 99) == 7
+    assert loadtest.percentile([], 50) == 0.0
+
+def test_offline_run_exercises_transcription_and_mapping(capsys):
+    for dependency in ("PyQt5", "assemblyai", "openai", "httpx", "numpy"):
+        pytest.importorskip(dependency)
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    exit_code = loadtest.main([
+        "--jobs", "3", "--concurrency", "3", "--latency-ms", "0", "--polls", "0",
+        "--poll-interval", "0.01", "--utterances", "20", "--upload-bytes", "1024", "--seed", "1",
+    ])
+    report = capsys.readouterr().out
+    assert exit_code == 0
+    assert "succeeded: 3  failed: 0" in report
+    assert "mapping: n=3" in report